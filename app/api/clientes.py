@@ -12,7 +12,7 @@ collection = "clientes"
 
 
 @router.post("/", response_model=Cliente, status_code=status.HTTP_201_CREATED, summary="Crear un nuevo cliente")
-async def create_cliente(cliente: ClienteBase = Body(...)):
+def create_cliente(cliente: ClienteBase = Body(...)):
     """
     Crea un nuevo cliente en la base de datos.
     """
@@ -31,7 +31,7 @@ async def create_cliente(cliente: ClienteBase = Body(...)):
 
 
 @router.get("/{id}", response_model=Cliente, status_code=status.HTTP_200_OK, summary="Obtener un cliente por ID")
-async def get_cliente_by_id(id: str = Path(..., alias="id")):
+def get_cliente_by_id(id: str = Path(..., alias="id")):
     """
     Obtiene los detalles de un cliente específico por su ID.
     """
@@ -49,7 +49,7 @@ async def get_cliente_by_id(id: str = Path(..., alias="id")):
 
 
 @router.put("/{id}", response_model=Cliente, status_code=status.HTTP_200_OK, summary="Actualizar un cliente por ID")
-async def update_cliente(id: str = Path(..., alias="id"), update_data: ClienteUpdate = Body(...)):
+def update_cliente(id: str = Path(..., alias="id"), update_data: ClienteUpdate = Body(...)):
     """
     Actualiza la información de un cliente existente.
     """
@@ -79,7 +79,7 @@ async def update_cliente(id: str = Path(..., alias="id"), update_data: ClienteUp
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, summary="Eliminar un cliente por ID")
-async def delete_cliente(id: str = Path(..., alias="id")):
+def delete_cliente(id: str = Path(..., alias="id")):
     """
     Elimina un cliente de la base de datos.
     """
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Body, Path
 from app.core.db import db
 from app.models import CobroCreate, Cobro, StatusCobro, Tarjeta
+from app.simulacion import simular_cobro
 from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from datetime import datetime
@@ -11,28 +12,8 @@ collection = "cobros"
 tarjetas_collection = "tarjetas"
 
 
-def simular_cobro(tarjeta: Tarjeta, monto: float) -> (StatusCobro, str):
-    """
-    Función interna para aplicar las reglas de simulación definidas.
-    Devuelve (status, codigo_motivo)
-    """
-    last4 = tarjeta.last4
-
-    if last4 == "1111":
-        return StatusCobro.approved, "00"
-    elif last4 == "2222":
-        return StatusCobro.declined, "51"
-    elif last4 == "3333":
-        if monto > 1000:
-            return StatusCobro.declined, "61"
-        else:
-            return StatusCobro.approved, "00"
-    else:
-        return StatusCobro.approved, "00"
-
-
 @router.post("/", response_model=Cobro, status_code=status.HTTP_201_CREATED, summary="Realizar un cobro simulado")
-async def create_cobro(cobro_in: CobroCreate = Body(...)):
+def create_cobro(cobro_in: CobroCreate = Body(...)):
     """
     Realiza un cobro simulado sobre una tarjeta de prueba.
 
@@ -51,7 +32,7 @@ async def create_cobro(cobro_in: CobroCreate = Body(...)):
         if tarjeta_modelo.cliente_id != cliente_oid:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La tarjeta no pertenece al cliente especificado.")
 
-        status_cobro, motivo = simular_cobro(tarjeta_modelo, cobro_in.monto)
+        status_cobro, motivo = simular_cobro(tarjeta_modelo.last4, cobro_in.monto)
 
         cobro_data = {"cliente_id": cliente_oid, "tarjeta_id": tarjeta_oid, "monto": cobro_in.monto, "status": status_cobro, "codigo_motivo": motivo}
 
@@ -73,7 +54,7 @@ async def create_cobro(cobro_in: CobroCreate = Body(...)):
 
 
 @router.post("/{cobro_id}/reembolso", response_model=Cobro, status_code=status.HTTP_200_OK, summary="Reembolsar un cobro")
-async def create_reembolso(cobro_id: str = Path(..., alias="cobro_id")):
+def create_reembolso(cobro_id: str = Path(..., alias="cobro_id")):
     """
     Reembolsa un cobro que haya sido previamente aprobado.
     Actualiza el estado 'reembolsado' a true y fija la 'fecha_reembolso'.
@@ -104,7 +85,7 @@ async def create_reembolso(cobro_id: str = Path(..., alias="cobro_id")):
 
 
 @router.get("/{cliente_id}", response_model=List[Cobro], status_code=status.HTTP_200_OK, summary="Obtener historial de cobros por cliente")
-async def get_historial_por_cliente(cliente_id: str = Path(..., alias="cliente_id")):
+def get_historial_por_cliente(cliente_id: str = Path(..., alias="cliente_id")):
     """
     Consulta todo el historial de cobros (aprobados, declinados y reembolsados) para un cliente específico.
     """
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, HTTPException, status, Body, Path
+from fastapi import APIRouter, HTTPException, status, Body, Path, Header
 from app.core.db import db
 from app.models import TarjetaCreate, TarjetaUpdate, Tarjeta
 from app.luhn import validate_luhn
+from app.bins import bin_index, BIN_RELOAD_TOKEN
 from pydantic import ValidationError
 from bson.objectid import ObjectId
 from pymongo.errors import PyMongoError
 from pymongo.results import DeleteResult
 from datetime import datetime
+from typing import Optional
+import hmac
 
 router = APIRouter()
 collection = "tarjetas"
@@ -14,12 +17,13 @@ clientes_collection = "clientes"
 
 
 @router.post("/", response_model=Tarjeta, status_code=status.HTTP_201_CREATED, summary="Registrar una tarjeta de prueba")
-async def create_tarjeta(tarjeta_in: TarjetaCreate = Body(...)):
+def create_tarjeta(tarjeta_in: TarjetaCreate = Body(...)):
     """
     Registra una nueva tarjeta de prueba para un cliente.
 
     - Valida el PAN completo usando el algoritmo de Luhn.
     - NO guarda el PAN completo, solo el 'bin', 'last4' y 'pan_masked'.
+    - Enriquece la tarjeta con red, emisor y tipo a partir de la tabla de BINs en memoria.
     """
     if not validate_luhn(tarjeta_in.pan_completo):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El número de tarjeta (PAN) no es válido según el algoritmo de Luhn.")
@@ -35,7 +39,7 @@ async def create_tarjeta(tarjeta_in: TarjetaCreate = Body(...)):
     try:
         pan = tarjeta_in.pan_completo
 
-        tarjeta_db_data = {"cliente_id": cliente_oid, "pan_masked": f"************{pan[-4:]}", "last4": pan[-4:], "bin": pan[:6]}
+        tarjeta_db_data = {"cliente_id": cliente_oid, "pan_masked": f"************{pan[-4:]}", "last4": pan[-4:], "bin": pan[:6], **bin_index.enrich(pan)}
 
         tarjeta_db = Tarjeta.model_validate(tarjeta_db_data)
 
@@ -53,8 +57,28 @@ async def create_tarjeta(tarjeta_in: TarjetaCreate = Body(...)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Datos de tarjeta inválidos: {e}")
 
 
+@router.post("/bins/recargar", status_code=status.HTTP_200_OK, summary="Recargar la tabla de BINs")
+def reload_bins(x_admin_token: Optional[str] = Header(None)):
+    """
+    Recarga en caliente la tabla de rangos de BIN desde disco. Requiere el header 'X-Admin-Token'.
+    Si la carga falla se conserva la tabla anterior.
+
+    Cada proceso de uvicorn tiene su propia tabla: con '--workers' > 1 solo se recarga el proceso
+    que atiende la solicitud.
+    """
+    if not BIN_RELOAD_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, BIN_RELOAD_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No autorizado para recargar la tabla de BINs.")
+
+    try:
+        rangos = bin_index.load()
+    except (OSError, ValueError, KeyError) as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"No se pudo recargar la tabla de BINs: {e}")
+
+    return {"rangos": rangos}
+
+
 @router.get("/{id}", response_model=Tarjeta, status_code=status.HTTP_200_OK, summary="Obtener una tarjeta por ID")
-async def get_tarjeta_by_id(id: str = Path(..., alias="id")):
+def get_tarjeta_by_id(id: str = Path(..., alias="id")):
     """
     Obtiene los detalles de una tarjeta (enmascarada) por su ID.
     """
@@ -72,7 +96,7 @@ async def get_tarjeta_by_id(id: str = Path(..., alias="id")):
 
 
 @router.put("/{id}",response_model=Tarjeta, status_code=status.HTTP_200_OK, summary="Actualizar metadatos de una tarjeta (si aplica)")
-async def update_tarjeta(id: str = Path(..., alias="id"), update_data: TarjetaUpdate = Body(...)):
+def update_tarjeta(id: str = Path(..., alias="id"), update_data: TarjetaUpdate = Body(...)):
     """
     Actualiza metadatos de una tarjeta. El PDF especifica que el PAN completo no debe ser actualizable.
     """
@@ -99,7 +123,7 @@ async def update_tarjeta(id: str = Path(..., alias="id"), update_data: TarjetaUp
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, summary="Eliminar una tarjeta por ID")
-async def delete_tarjeta(id: str = Path(..., alias="id")):
+def delete_tarjeta(id: str = Path(..., alias="id")):
     """
     Elimina una tarjeta de la base de datos.
     """
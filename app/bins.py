@@ -0,0 +1,199 @@
+import csv
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from heapq import heappop, heappush
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+DEFAULT_BIN_TABLE_PATH = Path(__file__).parent / "data" / "bins.csv"
+BIN_TABLE_PATH = os.getenv("BIN_TABLE_PATH", str(DEFAULT_BIN_TABLE_PATH))
+# Token para POST /tarjetas/bins/recargar; si no se define, la recarga por API queda deshabilitada.
+BIN_RELOAD_TOKEN = os.getenv("BIN_RELOAD_TOKEN")
+
+BinInfo = Tuple[str, str, str]
+
+
+class BinTable:
+    """
+    Tabla de rangos de BIN de solo lectura.
+
+    Los rangos de 6 dígitos se expanden al espacio de 8 dígitos (411111 -> 41111100-41111199)
+    y todos se guardan en arreglos ordenados de inicios y fines, con un índice a una lista de
+    metadatos (red, emisor, tipo) deduplicados. La búsqueda es una búsqueda binaria.
+
+    Los rangos anidados o solapados, de cualquier longitud, se aplanan al construir la tabla en
+    segmentos disjuntos donde gana el rango más angosto (a igual ancho, el que aparece después
+    en el archivo).
+    """
+
+    KEY_LENGTH = 8
+    BIN_LENGTHS = (6, 8)
+
+    def __init__(self, rows: Iterable[Tuple[str, str, str, str, str]] = ()):
+        ranges = []
+        metadata = {}
+
+        for inicio, fin, red, emisor, tipo in rows:
+            if len(inicio) != len(fin) or len(inicio) not in self.BIN_LENGTHS or not (inicio.isdigit() and fin.isdigit()):
+                raise ValueError(f"Rango de BIN inválido: {inicio}-{fin}")
+            if int(inicio) > int(fin):
+                raise ValueError(f"Rango de BIN invertido: {inicio}-{fin}")
+
+            scale = 10 ** (self.KEY_LENGTH - len(inicio))
+            info = (red, emisor, tipo)
+            meta_idx = metadata.setdefault(info, len(metadata))
+            ranges.append((int(inicio) * scale, (int(fin) + 1) * scale - 1, meta_idx))
+
+        self.metadata: List[BinInfo] = list(metadata)
+        self.size = len(ranges)
+
+        segments = _flatten(ranges)
+        self.starts = array("Q", (r[0] for r in segments))
+        self.ends = array("Q", (r[1] for r in segments))
+        self.meta = array("I", (r[2] for r in segments))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_csv(cls, path) -> "BinTable":
+        """
+        Carga la tabla desde un CSV con columnas: inicio,fin,red,emisor,tipo.
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            return cls((row["inicio"], row["fin"], row["red"], row["emisor"], row["tipo"]) for row in reader)
+
+    def lookup(self, pan: str) -> Optional[BinInfo]:
+        """
+        Devuelve (red, emisor, tipo) para el PAN o BIN dado, o None si no hay rango que lo cubra.
+        Un BIN de 6 o 7 dígitos se completa con ceros a la derecha.
+        """
+        prefix = pan[:self.KEY_LENGTH]
+        if len(prefix) < self.BIN_LENGTHS[0] or not prefix.isdigit():
+            return None
+
+        value = int(prefix.ljust(self.KEY_LENGTH, "0"))
+        i = bisect_right(self.starts, value) - 1
+
+        if i >= 0 and value <= self.ends[i]:
+            return self.metadata[self.meta[i]]
+
+        return None
+
+    def lookup_many(self, pans: Iterable[str]) -> List[Optional[BinInfo]]:
+        """Versión en lote de lookup, para los flujos de registro masivo."""
+        lookup = self.lookup
+        return [lookup(pan) for pan in pans]
+
+
+def _flatten(ranges: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Convierte rangos (inicio, fin, meta) posiblemente solapados en segmentos disjuntos y
+    ordenados. Barre los puntos de inicio/fin manteniendo en un heap los rangos activos
+    ordenados por ancho, así cada segmento toma los metadatos del rango más angosto.
+    """
+    ordered = sorted(ranges)
+    if all(prev[1] < cur[0] for prev, cur in zip(ordered, ordered[1:])):
+        return ordered
+
+    events = []
+    for order, (start, end, _) in enumerate(ranges):
+        events.append((start, 1, order))
+        events.append((end + 1, 0, order))
+    events.sort()
+
+    active = set()
+    heap = []
+    segments = []
+    i = 0
+
+    while i < len(events):
+        point = events[i][0]
+        while i < len(events) and events[i][0] == point:
+            _, is_start, order = events[i]
+            if is_start:
+                start, end, _ = ranges[order]
+                active.add(order)
+                heappush(heap, (end - start, -order, order))
+            else:
+                active.discard(order)
+            i += 1
+
+        while heap and heap[0][2] not in active:
+            heappop(heap)
+
+        if not heap:
+            continue
+
+        # Siempre queda un evento de fin pendiente mientras haya rangos activos.
+        segment_end = events[i][0] - 1
+        meta = ranges[heap[0][2]][2]
+
+        if segments and segments[-1][1] == point - 1 and segments[-1][2] == meta:
+            segments[-1] = (segments[-1][0], segment_end, meta)
+        else:
+            segments.append((point, segment_end, meta))
+
+    return segments
+
+
+class BinIndex:
+    """
+    Índice de BINs recargable en caliente.
+
+    La recarga construye una tabla nueva y la sustituye de forma atómica, así que las
+    búsquedas en curso nunca ven una tabla a medio cargar.
+    """
+
+    def __init__(self, path: str = BIN_TABLE_PATH):
+        self.path = path
+        self.table = BinTable()
+        self._lock = threading.Lock()
+
+    def load(self, path: Optional[str] = None, allow_missing: bool = False) -> int:
+        """
+        Carga (o recarga) la tabla desde disco. Devuelve el número de rangos cargados.
+
+        Si la carga falla se lanza la excepción y se conserva la tabla anterior. Con
+        'allow_missing' (solo al iniciar) un archivo inexistente deja el índice vacío.
+        """
+        with self._lock:
+            path = path or self.path
+
+            if allow_missing and not os.path.exists(path):
+                table = BinTable()
+            else:
+                table = BinTable.from_csv(path)
+
+            self.path = path
+            self.table = table
+
+            return len(table)
+
+    def lookup(self, pan: str) -> Optional[BinInfo]:
+        return self.table.lookup(pan)
+
+    def lookup_many(self, pans: Iterable[str]) -> List[Optional[BinInfo]]:
+        return self.table.lookup_many(pans)
+
+    def enrich(self, pan: str) -> dict:
+        """Campos de enriquecimiento (red, emisor, tipo) para guardar junto a la tarjeta."""
+        return _as_fields(self.table.lookup(pan))
+
+    def enrich_many(self, pans: Iterable[str]) -> List[dict]:
+        return [_as_fields(info) for info in self.table.lookup_many(pans)]
+
+
+def _as_fields(info: Optional[BinInfo]) -> dict:
+    if info is None:
+        return {"red": None, "emisor": None, "tipo": None}
+
+    red, emisor, tipo = info
+    return {"red": red, "emisor": emisor, "tipo": tipo}
+
+
+bin_index = BinIndex()
@@ -0,0 +1,207 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from starlette.responses import JSONResponse
+
+
+RATE_PER_SECOND = float(os.getenv("ADMISION_RATE_POR_SEGUNDO", "20"))
+BURST = float(os.getenv("ADMISION_RAFAGA", "40"))
+MAX_DB_INFLIGHT = int(os.getenv("ADMISION_MAX_DB_CONCURRENTES", "40"))
+MAX_QUEUE = int(os.getenv("ADMISION_MAX_COLA", "100"))
+MAX_QUEUE_WAIT = float(os.getenv("ADMISION_MAX_ESPERA_SEGUNDOS", "0.5"))
+MAX_TRACKED_CLIENTS = int(os.getenv("ADMISION_MAX_CLIENTES", "10000"))
+
+EXEMPT_PATHS = {"/", "/docs", "/redoc", "/openapi.json", "/docs/oauth2-redirect", "/metricas"}
+DB_PATH_PREFIXES = ("/clientes", "/tarjetas", "/cobros")
+NON_DB_PATHS = {"/tarjetas/bins/recargar"}
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class TokenBucket:
+    """
+    Token bucket de un cliente. Se rellena a 'rate' tokens por segundo hasta 'capacity'.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """
+        Consume un token si hay disponible.
+        Devuelve 0 si se admitió, o los segundos que faltan para el siguiente token.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Indica si el bucket ya se rellenó por completo (descartarlo no regala tokens)."""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class AdmissionStats:
+    """Contadores de admisión que se exportan en el endpoint de métricas."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.admitted = 0
+        self.shed_rate_limited = 0
+        self.shed_overloaded = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, wait_ms: float):
+        self.wait_count += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+        for i, limit in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= limit:
+                self.wait_buckets[i] += 1
+                return
+
+        self.wait_buckets[-1] += 1
+
+    def snapshot(self) -> dict:
+        labels = [f"<={limit}ms" for limit in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+
+        return {
+            "admitidas": self.admitted,
+            "rechazadas": {"rate_limit": self.shed_rate_limited, "sobrecarga": self.shed_overloaded},
+            "db_en_curso": self.in_flight,
+            "en_cola": self.waiting,
+            "espera_cola": {
+                "conteo": self.wait_count,
+                "promedio_ms": self.wait_total_ms / self.wait_count if self.wait_count else 0.0,
+                "max_ms": self.wait_max_ms,
+                "histograma": dict(zip(labels, self.wait_buckets)),
+            },
+        }
+
+
+stats = AdmissionStats()
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware ASGI de control de admisión.
+
+    - Aplica un token bucket por cliente, identificado por la IP de 'scope["client"]'. Detrás de
+      un balanceador, uvicorn ('--proxy-headers --forwarded-allow-ips') reemplaza esa IP por la de
+      'X-Forwarded-For' solo si la conexión viene de un proxy confiable, así el cliente no puede
+      elegir su identidad y los clientes detrás del mismo proxy no comparten bucket.
+    - Limita las solicitudes concurrentes contra MongoDB (solo en las rutas que lo usan); las
+      solicitudes en exceso esperan en una cola acotada y, si no entran a tiempo, se rechazan con
+      503. Los handlers son 'def' y corren en el threadpool, así que cada solicitud admitida es
+      una operación de DB en curso.
+    """
+
+    def __init__(self, app, rate: float = RATE_PER_SECOND, burst: float = BURST, max_inflight: int = MAX_DB_INFLIGHT,
+                 max_queue: int = MAX_QUEUE, max_wait: float = MAX_QUEUE_WAIT, max_clients: int = MAX_TRACKED_CLIENTS,
+                 clock=time.monotonic):
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_clients = max_clients
+        self.clock = clock
+        self.buckets = OrderedDict()
+        self.semaphore = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self._take_token(self._client_key(scope))
+        if retry_after > 0:
+            stats.shed_rate_limited += 1
+            response = self._reject(429, "Demasiadas solicitudes para este cliente.", retry_after)
+            await response(scope, receive, send)
+            return
+
+        if not self._uses_db(scope["path"]):
+            stats.admitted += 1
+            await self.app(scope, receive, send)
+            return
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_inflight)
+
+        if self.semaphore.locked() and stats.waiting >= self.max_queue:
+            stats.shed_overloaded += 1
+            response = self._reject(503, "Servicio saturado, intente más tarde.", self.max_wait)
+            await response(scope, receive, send)
+            return
+
+        start = self.clock()
+        stats.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            stats.shed_overloaded += 1
+            response = self._reject(503, "Servicio saturado, intente más tarde.", self.max_wait)
+            await response(scope, receive, send)
+            return
+        finally:
+            stats.waiting -= 1
+            stats.observe_wait((self.clock() - start) * 1000)
+
+        stats.admitted += 1
+        stats.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats.in_flight -= 1
+            self.semaphore.release()
+
+    @staticmethod
+    def _uses_db(path: str) -> bool:
+        return path.startswith(DB_PATH_PREFIXES) and path.rstrip("/") not in NON_DB_PATHS
+
+    def _client_key(self, scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "desconocido"
+
+    def _take_token(self, key: str) -> float:
+        now = self.clock()
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            if len(self.buckets) >= self.max_clients:
+                # Solo se descarta el bucket más antiguo si ya está lleno; si no, la tabla está
+                # ocupada por clientes activos y el cliente nuevo espera a que se libere.
+                oldest = next(iter(self.buckets.values()))
+                if not oldest.is_full(now):
+                    return (oldest.capacity - oldest.tokens) / oldest.rate - (now - oldest.updated)
+                self.buckets.popitem(last=False)
+
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self.buckets[key] = bucket
+        else:
+            self.buckets.move_to_end(key)
+
+        return bucket.take(now)
+
+    @staticmethod
+    def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+        return JSONResponse(status_code=status_code, content={"detail": detail}, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
@@ -0,0 +1,2 @@
+MONGO_URI = "mongodb://localhost:27017/"
+DATABASE_NAME = "prueba_tecnica_cobros"
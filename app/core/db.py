@@ -1,8 +1,5 @@
 from pymongo import MongoClient
-
-
-MONGO_URI = "mongodb://localhost:27017/"
-DATABASE_NAME = "prueba_tecnica_cobros"
+from app.core.config import MONGO_URI, DATABASE_NAME
 
 
 try:
@@ -21,6 +21,21 @@ def validate_luhn(pan: str) -> bool:
     return checksum % 10 == 0
 
 
+def _luhn_total(digits: str) -> int:
+    """Suma de Luhn: duplica los dígitos en posición impar contando desde la derecha."""
+    length = len(digits)
+    total = 0
+
+    for i in range(length - 2, -1, -2):
+        doubled = int(digits[i]) * 2
+        total += (doubled % 10) + (doubled // 10)
+
+    for i in range(length - 1, -1, -2):
+        total += int(digits[i])
+
+    return total
+
+
 def generate_luhn(bin_prefix: str, length: int) -> str:
     random_part_length = length - len(bin_prefix) - 1
 
@@ -31,16 +46,27 @@ def generate_luhn(bin_prefix: str, length: int) -> str:
 
     partial_pan = bin_prefix + random_digits + "0"
 
-    digits = [int(d) for d in partial_pan]
-    total = 0
+    checksum_digit = (10 - (_luhn_total(partial_pan) % 10)) % 10
 
-    for i in range(length - 2, -1, -2):
-        doubled = digits[i] * 2
-        total += (doubled % 10) + (doubled // 10)
+    return partial_pan[:-1] + str(checksum_digit)
 
-    for i in range(length - 1, -1, -2):
-        total += digits[i]
 
-    checksum_digit = (10 - (total % 10)) % 10
+def generate_luhn_with_last4(bin_prefix: str, length: int, last4: str, rng: random.Random = random) -> str:
+    """
+    Genera un PAN válido según Luhn que empieza con 'bin_prefix' y termina en 'last4'.
+    El dígito anterior a 'last4' se ajusta para que el checksum sea correcto.
+    """
+    if len(last4) != 4 or not last4.isdigit():
+        raise ValueError("Los últimos 4 dígitos deben ser exactamente 4 dígitos numéricos.")
+
+    random_part_length = length - len(bin_prefix) - 5
+
+    if random_part_length < 0:
+        raise ValueError("La longitud del BIN más los últimos 4 dígitos es mayor que la longitud total.")
+
+    prefix = bin_prefix + "".join(str(rng.randint(0, 9)) for _ in range(random_part_length))
+
+    # El dígito ajustable queda en posición par desde la derecha (no se duplica).
+    fix_digit = (10 - (_luhn_total(prefix + "0" + last4) % 10)) % 10
 
-    return partial_pan[:-1] + str(checksum_digit)
\ No newline at end of file
+    return prefix + str(fix_digit) + last4
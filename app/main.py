@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 from app.core.db import db
+from app.core.admission import AdmissionControlMiddleware, stats as admission_stats
+from app.bins import bin_index
 from app.api import clientes, tarjetas, cobros
 from contextlib import asynccontextmanager
 
@@ -11,12 +13,15 @@ async def lifespan(app: FastAPI):
     else:
         print("La aplicación ha iniciado y la conexión a DB está lista.")
 
+    print(f"Tabla de BINs cargada con {bin_index.load(allow_missing=True)} rangos.")
+
     yield
 
     print("La aplicación se ha detenido.")
 
 
 app = FastAPI(title="API de Cobros Simulados", description="Prueba Técnica para simular un CRUD de cobros.", version="1.0.0", lifespan=lifespan)
+app.add_middleware(AdmissionControlMiddleware)
 
 
 @app.get("/", tags=["Root"])
@@ -26,6 +31,14 @@ async def read_root():
     """
     return {"message": "Bienvenido a la API de Cobros Simulados"}
 
+
+@app.get("/metricas", tags=["Root"])
+async def read_metricas():
+    """
+    Métricas del control de admisión: solicitudes rechazadas y tiempos de espera en cola.
+    """
+    return admission_stats.snapshot()
+
 app.include_router(clientes.router, prefix="/clientes", tags=["Clientes"])
 app.include_router(tarjetas.router, prefix="/tarjetas", tags=["Tarjetas"])
 app.include_router(cobros.router, prefix="/cobros", tags=["Cobros"])
@@ -73,6 +73,9 @@ class Tarjeta(MongoModel):
     pan_masked: str
     last4: str
     bin: str
+    red: Optional[str] = None
+    emisor: Optional[str] = None
+    tipo: Optional[str] = None
 
 
 class Cliente(MongoModel):
@@ -0,0 +1,316 @@
+"""
+CLI para sembrar datos sintéticos (clientes, tarjetas y cobros) en volumen.
+
+Uso:
+    python -m app.seed --clientes 1000000 --workers 8
+    python -m app.seed --clientes 10000 --dry-run salida/
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+from pathlib import Path
+from bson.json_util import dumps
+from bson.objectid import ObjectId
+from app.bins import bin_index
+from app.core.config import MONGO_URI, DATABASE_NAME
+from app.luhn import generate_luhn_with_last4
+from app.simulacion import simular_cobro
+
+
+COLLECTIONS = ("clientes", "tarjetas", "cobros")
+PAN_LENGTH = 16
+# El PAN generado necesita espacio para el dígito de ajuste de Luhn y los 4 últimos dígitos.
+MAX_BIN_LENGTH = PAN_LENGTH - 5
+DEFAULT_BINS = "411111,400000,450000,510000,601100"
+DEFAULT_LAST4_MIX = "1111=0.25,2222=0.15,3333=0.2,otro=0.4"
+NOMBRES = ["Ana", "Luis", "María", "Jorge", "Sofía", "Carlos", "Lucía", "Miguel", "Elena", "Diego"]
+APELLIDOS = ["García", "Hernández", "López", "Martínez", "González", "Pérez", "Sánchez", "Ramírez", "Torres", "Flores"]
+
+
+def parse_range(value: str) -> tuple:
+    """Convierte 'a-b' o 'a' en una tupla (min, max)."""
+    try:
+        if "-" in value:
+            low, high = (int(v) for v in value.split("-", 1))
+        else:
+            low = high = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Rango inválido: {value}")
+
+    if low < 0 or low > high:
+        raise argparse.ArgumentTypeError(f"Rango inválido: {value}")
+
+    return low, high
+
+
+def parse_positive_int(value: str) -> int:
+    """Entero mayor que cero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Entero inválido: {value}")
+
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"Debe ser mayor que cero: {value}")
+
+    return number
+
+
+def parse_non_negative_int(value: str) -> int:
+    """Entero mayor o igual que cero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Entero inválido: {value}")
+
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"No puede ser negativo: {value}")
+
+    return number
+
+
+def parse_bins(value: str) -> list:
+    """Convierte '411111,510000' en una lista de BINs numéricos de hasta MAX_BIN_LENGTH dígitos."""
+    bins = [b.strip() for b in value.split(",") if b.strip()]
+
+    if not bins or any(not b.isdigit() or len(b) > MAX_BIN_LENGTH for b in bins):
+        raise argparse.ArgumentTypeError(f"BINs inválidos (solo dígitos, máximo {MAX_BIN_LENGTH}): {value}")
+
+    return bins
+
+
+def parse_probability(value: str) -> float:
+    """Fracción entre 0 y 1."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fracción inválida: {value}")
+
+    if not 0 <= number <= 1:
+        raise argparse.ArgumentTypeError(f"Debe estar entre 0 y 1: {value}")
+
+    return number
+
+
+def parse_last4_mix(value: str) -> tuple:
+    """Convierte '1111=0.25,otro=0.75' en ([last4], [pesos]). 'otro' genera últimos 4 dígitos aleatorios."""
+    choices, weights = [], []
+
+    try:
+        for item in value.split(","):
+            last4, weight = item.split("=")
+            last4 = last4.strip()
+            if last4 != "otro" and (len(last4) != 4 or not last4.isdigit()):
+                raise ValueError
+            choices.append(last4)
+            weights.append(float(weight))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Mezcla de last4 inválida: {value}")
+
+    if sum(weights) <= 0:
+        raise argparse.ArgumentTypeError(f"Mezcla de last4 inválida: {value}")
+
+    return choices, weights
+
+
+def generate_chunk(chunk_idx: int, clientes: int, config: dict) -> dict:
+    """
+    Genera los documentos de un bloque de clientes con sus tarjetas y cobros.
+    Los ObjectId se generan en el proceso, así las referencias no requieren consultas a la DB.
+    """
+    # La semilla combina ambos valores: con 'semilla + chunk_idx' el bloque 1 de la semilla 0
+    # repetiría el bloque 0 de la semilla 1.
+    rng = random.Random(f"{config['semilla']}:{chunk_idx}")
+    now = config["ahora"]
+    spread = timedelta(days=config["dias"]).total_seconds()
+    last4_choices, last4_weights = config["last4_mix"]
+    docs = {name: [] for name in COLLECTIONS}
+    pans = []
+
+    for i in range(clientes):
+        cliente_id = ObjectId()
+        cliente_fecha = now - timedelta(seconds=rng.uniform(0, spread))
+        nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+        docs["clientes"].append({
+            "_id": cliente_id,
+            "nombre": nombre,
+            "email": f"cliente{config['semilla']}_{chunk_idx}_{i}@example.com",
+            "telefono": f"55{rng.randrange(10 ** 8):08d}",
+            "created_at": cliente_fecha,
+            "updated_at": cliente_fecha,
+        })
+
+        for _ in range(rng.randint(*config["tarjetas_por_cliente"])):
+            last4 = rng.choices(last4_choices, last4_weights)[0]
+            if last4 == "otro":
+                last4 = f"{rng.randrange(10 ** 4):04d}"
+
+            pan = generate_luhn_with_last4(rng.choice(config["bins"]), PAN_LENGTH, last4, rng)
+            pans.append(pan)
+
+            tarjeta_id = ObjectId()
+            tarjeta_fecha = cliente_fecha + (now - cliente_fecha) * rng.random()
+            tarjeta = {
+                "_id": tarjeta_id,
+                "cliente_id": cliente_id,
+                "pan_masked": f"************{last4}",
+                "last4": last4,
+                "bin": pan[:6],
+                "created_at": tarjeta_fecha,
+                "updated_at": tarjeta_fecha,
+            }
+            docs["tarjetas"].append(tarjeta)
+
+            for _ in range(rng.randint(*config["cobros_por_tarjeta"])):
+                monto = round(min(rng.lognormvariate(5.5, 1.2), 50000), 2)
+                status_cobro, motivo = simular_cobro(last4, monto)
+                fecha = tarjeta_fecha + (now - tarjeta_fecha) * rng.random()
+                reembolsado = status_cobro.value == "approved" and rng.random() < config["reembolsos"]
+                fecha_reembolso = fecha + (now - fecha) * rng.random() if reembolsado else None
+
+                docs["cobros"].append({
+                    "cliente_id": cliente_id,
+                    "tarjeta_id": tarjeta_id,
+                    "monto": monto,
+                    "fecha_intento": fecha,
+                    "status": status_cobro.value,
+                    "codigo_motivo": motivo,
+                    "reembolsado": reembolsado,
+                    "fecha_reembolso": fecha_reembolso,
+                    "created_at": fecha,
+                    "updated_at": fecha_reembolso or fecha,
+                })
+
+    for tarjeta, fields in zip(docs["tarjetas"], bin_index.enrich_many(pans)):
+        tarjeta.update(fields)
+
+    return docs
+
+
+def write_ndjson(chunk_idx: int, docs: dict, output_dir: str):
+    for name in COLLECTIONS:
+        path = Path(output_dir) / f"{name}-{chunk_idx:05d}.ndjson"
+        with open(path, "w", encoding="utf-8") as f:
+            for doc in docs[name]:
+                f.write(dumps(doc))
+                f.write("\n")
+
+
+def write_mongo(docs: dict, config: dict):
+    db = _worker_db(config)
+    batch_size = config["batch_size"]
+
+    for name in COLLECTIONS:
+        collection_docs = docs[name]
+        for start in range(0, len(collection_docs), batch_size):
+            db[name].insert_many(collection_docs[start:start + batch_size], ordered=False)
+
+
+_db = None
+
+
+def _worker_db(config: dict):
+    """Un MongoClient por proceso: pymongo no es seguro tras un fork."""
+    global _db
+    if _db is None:
+        from pymongo import MongoClient
+        _db = MongoClient(config["mongo_uri"])[config["database"]]
+    return _db
+
+
+def init_worker(bin_table: str, allow_missing: bool):
+    bin_index.load(bin_table, allow_missing=allow_missing)
+
+
+def run_chunk(args) -> dict:
+    chunk_idx, clientes, config = args
+    docs = generate_chunk(chunk_idx, clientes, config)
+
+    if config["dry_run"]:
+        write_ndjson(chunk_idx, docs, config["dry_run"])
+    else:
+        write_mongo(docs, config)
+
+    return {name: len(docs[name]) for name in COLLECTIONS}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.seed", description="Genera datos sintéticos de clientes, tarjetas y cobros.")
+    parser.add_argument("--clientes", type=parse_positive_int, default=1000, help="Número de clientes a generar.")
+    parser.add_argument("--tarjetas-por-cliente", type=parse_range, default=(1, 3), help="Rango 'min-max' de tarjetas por cliente.")
+    parser.add_argument("--cobros-por-tarjeta", type=parse_range, default=(0, 10), help="Rango 'min-max' de cobros por tarjeta.")
+    parser.add_argument("--last4-mix", type=parse_last4_mix, default=DEFAULT_LAST4_MIX, help="Pesos de last4, p. ej. '1111=0.25,2222=0.15,3333=0.2,otro=0.4'.")
+    parser.add_argument("--bins", type=parse_bins, default=DEFAULT_BINS, help="BINs separados por comas para generar los PANs.")
+    parser.add_argument("--dias", type=parse_non_negative_int, default=365, help="Días hacia atrás en los que se reparten las fechas.")
+    parser.add_argument("--reembolsos", type=parse_probability, default=0.05, help="Fracción de cobros aprobados que se reembolsan.")
+    parser.add_argument("--workers", type=parse_positive_int, default=os.cpu_count() or 1, help="Procesos en paralelo.")
+    parser.add_argument("--clientes-por-bloque", type=parse_positive_int, default=1000, help="Clientes que genera cada tarea.")
+    parser.add_argument("--batch-size", type=parse_positive_int, default=1000, help="Documentos por insert_many.")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla para reproducir los datos. Forma parte de los emails, así que use otra para no duplicarlos.")
+    parser.add_argument("--bin-table", default=None, help="Tabla de BINs para enriquecer las tarjetas (por defecto la de la app).")
+    parser.add_argument("--mongo-uri", default=MONGO_URI, help="URI de MongoDB donde se insertan los datos.")
+    parser.add_argument("--database", default=DATABASE_NAME, help="Base de datos donde se insertan los datos.")
+    parser.add_argument("--dry-run", metavar="DIR", default=None, help="Escribe archivos NDJSON en DIR en lugar de insertar en la DB.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    config = {
+        "tarjetas_por_cliente": args.tarjetas_por_cliente,
+        "cobros_por_tarjeta": args.cobros_por_tarjeta,
+        "last4_mix": args.last4_mix,
+        "bins": args.bins,
+        "dias": args.dias,
+        "reembolsos": args.reembolsos,
+        "batch_size": args.batch_size,
+        "semilla": args.semilla,
+        "ahora": datetime.now(),
+        "dry_run": args.dry_run,
+    }
+
+    if args.dry_run:
+        Path(args.dry_run).mkdir(parents=True, exist_ok=True)
+    else:
+        from pymongo import MongoClient
+        from pymongo.errors import PyMongoError
+
+        try:
+            with MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000) as client:
+                client.server_info()
+        except PyMongoError as e:
+            print(f"ERROR: No se pudo conectar a MongoDB en {args.mongo_uri}: {e}", file=sys.stderr)
+            return 1
+
+        config["mongo_uri"] = args.mongo_uri
+        config["database"] = args.database
+
+    tasks = []
+    for chunk_idx, start in enumerate(range(0, args.clientes, args.clientes_por_bloque)):
+        tasks.append((chunk_idx, min(args.clientes_por_bloque, args.clientes - start), config))
+
+    totals = {name: 0 for name in COLLECTIONS}
+    start = time.perf_counter()
+
+    with Pool(processes=args.workers, initializer=init_worker, initargs=(args.bin_table or bin_index.path, args.bin_table is None)) as pool:
+        for done, counts in enumerate(pool.imap_unordered(run_chunk, tasks), start=1):
+            for name in COLLECTIONS:
+                totals[name] += counts[name]
+            elapsed = time.perf_counter() - start
+            print(f"[{done}/{len(tasks)}] {sum(totals.values())} docs, {sum(totals.values()) / elapsed:,.0f} docs/s", flush=True)
+
+    elapsed = time.perf_counter() - start
+    total = sum(totals.values())
+    resumen = ", ".join(f"{name}: {count}" for name, count in totals.items())
+    print(f"Listo en {elapsed:.2f}s. {resumen}. Total {total} docs ({total / elapsed if elapsed else 0:,.0f} docs/s).")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+from app.models import StatusCobro
+
+
+def simular_cobro(last4: str, monto: float) -> (StatusCobro, str):
+    """
+    Función interna para aplicar las reglas de simulación definidas según los 'last4' de la tarjeta.
+    Devuelve (status, codigo_motivo)
+    """
+    if last4 == "1111":
+        return StatusCobro.approved, "00"
+    elif last4 == "2222":
+        return StatusCobro.declined, "51"
+    elif last4 == "3333":
+        if monto > 1000:
+            return StatusCobro.declined, "61"
+        else:
+            return StatusCobro.approved, "00"
+    else:
+        return StatusCobro.approved, "00"
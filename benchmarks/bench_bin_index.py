@@ -0,0 +1,56 @@
+"""
+Benchmark de la tabla de BINs con ~500k rangos.
+
+Uso:
+    python -m benchmarks.bench_bin_index
+"""
+import random
+import time
+from app.bins import BinTable
+
+
+RANGES = 500_000
+LOOKUPS = 1_000_000
+REDES = ["VISA", "MASTERCARD", "AMEX", "DISCOVER"]
+TIPOS = ["credito", "debito", "prepago"]
+
+
+def build_rows(n: int):
+    emisores = [f"Banco {i}" for i in range(2000)]
+    rows = []
+
+    # 8 dígitos: rangos disjuntos de ancho 1-100 repartidos en el espacio completo.
+    step = 10 ** 8 // n
+    for i in range(n):
+        start = i * step
+        end = start + random.randint(0, min(99, step - 1))
+        rows.append((f"{start:08d}", f"{end:08d}", random.choice(REDES), random.choice(emisores), random.choice(TIPOS)))
+
+    # Rangos de red amplios que anidan a los de emisor, para ejercitar el aplanado de solapes.
+    for start in range(0, 10 ** 8, 10 ** 6):
+        rows.append((f"{start:08d}", f"{start + 10 ** 6 - 1:08d}", random.choice(REDES), "Red", random.choice(TIPOS)))
+
+    return rows
+
+
+def main():
+    random.seed(0)
+    rows = build_rows(RANGES)
+
+    start = time.perf_counter()
+    table = BinTable(rows)
+    build_s = time.perf_counter() - start
+
+    pans = [f"{random.randrange(10 ** 8):08d}00000000" for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    hits = sum(1 for info in table.lookup_many(pans) if info is not None)
+    lookup_s = time.perf_counter() - start
+
+    print(f"Rangos: {len(table)}  metadatos únicos: {len(table.metadata)}")
+    print(f"Construcción: {build_s:.2f}s")
+    print(f"Búsquedas: {LOOKUPS} en {lookup_s:.2f}s ({LOOKUPS / lookup_s:,.0f}/s, {lookup_s / LOOKUPS * 1e6:.2f} us/búsqueda, aciertos {hits})")
+
+
+if __name__ == "__main__":
+    main()
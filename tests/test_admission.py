@@ -0,0 +1,207 @@
+import asyncio
+import inspect
+import time
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+from app.core.admission import TokenBucket, AdmissionControlMiddleware, stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def build_app(**kwargs):
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, **kwargs)
+
+    @app.get("/recurso")
+    async def recurso():
+        return {"ok": True}
+
+    @app.get("/cobros/lento")
+    async def lento():
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+
+    @app.get("/cobros/bloqueante")
+    def bloqueante():
+        time.sleep(0.3)
+        return {"ok": True}
+
+    @app.post("/tarjetas/bins/recargar")
+    def recargar():
+        return {"ok": True}
+
+    return app
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(rate=1, capacity=2, now=0)
+    assert bucket.take(0) == 0
+    assert bucket.take(0) == 0
+    assert bucket.take(0) > 0
+    assert bucket.take(1) == 0
+
+
+def test_rate_limit_per_client_returns_429():
+    """Un cliente que agota su bucket recibe 429 con Retry-After; otro cliente no se ve afectado."""
+    stats.reset()
+    clock = FakeClock()
+    app = build_app(rate=1, burst=2, clock=clock)
+    client_a = TestClient(app, client=("10.0.0.1", 1000))
+    client_b = TestClient(app, client=("10.0.0.2", 1000))
+
+    assert client_a.get("/recurso").status_code == 200
+    assert client_a.get("/recurso").status_code == 200
+
+    response = client_a.get("/recurso")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    assert client_b.get("/recurso").status_code == 200
+
+    clock.now = 1.0
+    assert client_a.get("/recurso").status_code == 200
+
+    assert stats.shed_rate_limited == 1
+    assert stats.admitted == 4
+
+
+def test_rate_limit_ignores_client_header():
+    """Cambiar el header X-Cliente-Id en cada solicitud no da un bucket nuevo."""
+    stats.reset()
+    client = TestClient(build_app(rate=1, burst=2, clock=FakeClock()))
+
+    codes = [client.get("/recurso", headers={"X-Cliente-Id": str(i)}).status_code for i in range(4)]
+
+    assert codes == [200, 200, 429, 429]
+
+
+def test_clients_behind_trusted_proxy_get_separate_buckets():
+    """Detrás de un proxy confiable cada cliente se identifica por X-Forwarded-For; sin él, el header se ignora."""
+    stats.reset()
+    app = ProxyHeadersMiddleware(build_app(rate=1, burst=2, clock=FakeClock()), trusted_hosts="10.0.0.100")
+    proxy = TestClient(app, client=("10.0.0.100", 1000))
+    untrusted = TestClient(app, client=("10.0.0.200", 1000))
+
+    for _ in range(2):
+        assert proxy.get("/recurso", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 200
+    assert proxy.get("/recurso", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 429
+    assert proxy.get("/recurso", headers={"X-Forwarded-For": "203.0.113.2"}).status_code == 200
+
+    codes = [untrusted.get("/recurso", headers={"X-Forwarded-For": f"203.0.113.{i}"}).status_code for i in range(10, 14)]
+    assert codes == [200, 200, 429, 429]
+
+
+def test_full_client_table_does_not_evict_active_buckets():
+    """Con la tabla llena de clientes activos, un cliente nuevo se rechaza en vez de desalojar a otro."""
+    stats.reset()
+    clock = FakeClock()
+    app = build_app(rate=1, burst=2, max_clients=1, clock=clock)
+    client_a = TestClient(app, client=("10.0.0.1", 1000))
+    client_b = TestClient(app, client=("10.0.0.2", 1000))
+
+    assert client_a.get("/recurso").status_code == 200
+    assert client_b.get("/recurso").status_code == 429
+
+    clock.now = 1.0
+    assert client_b.get("/recurso").status_code == 200
+    assert client_b.get("/recurso").status_code == 200
+    assert client_b.get("/recurso").status_code == 429
+
+
+def test_concurrency_limit_sheds_with_503():
+    """Con el cupo de DB ocupado y la cola llena, las solicitudes en exceso se rechazan con 503."""
+    stats.reset()
+    app = build_app(rate=1000, burst=1000, max_inflight=1, max_queue=0, max_wait=0.05)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(client.get("/cobros/lento"), client.get("/cobros/lento"))
+
+    responses = asyncio.run(run())
+    codes = sorted(r.status_code for r in responses)
+
+    assert codes == [200, 503]
+    assert "Retry-After" in next(r for r in responses if r.status_code == 503).headers
+    assert stats.shed_overloaded == 1
+    assert stats.in_flight == 0
+
+
+def test_queue_wait_timeout_sheds_with_503():
+    """Si la espera en cola supera el máximo, la solicitud se rechaza y la espera queda registrada."""
+    stats.reset()
+    app = build_app(rate=1000, burst=1000, max_inflight=1, max_queue=10, max_wait=0.05)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(client.get("/cobros/lento"), client.get("/cobros/lento"))
+
+    codes = sorted(r.status_code for r in asyncio.run(run()))
+
+    assert codes == [200, 503]
+    assert stats.wait_count == 2
+    assert stats.snapshot()["espera_cola"]["max_ms"] >= 50
+
+
+def test_blocking_handler_sheds_on_time():
+    """Un handler 'def' con E/S bloqueante no bloquea el loop: la espera en cola vence a tiempo."""
+    stats.reset()
+    app = build_app(rate=1000, burst=1000, max_inflight=1, max_queue=10, max_wait=0.05)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/cobros/bloqueante"))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            second = await client.get("/cobros/bloqueante")
+            elapsed = time.perf_counter() - start
+            return await first, second, elapsed
+
+    first, second, elapsed = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert elapsed < 0.2
+    assert stats.wait_max_ms < 200
+
+
+def test_db_handlers_run_off_the_event_loop():
+    """Los handlers que usan pymongo (síncrono) deben ser 'def' para que corran en el threadpool."""
+    from app.main import app
+
+    db_routes = [r for r in app.routes if r.path.startswith(("/clientes", "/tarjetas", "/cobros"))]
+
+    assert db_routes
+    assert not any(inspect.iscoroutinefunction(r.endpoint) for r in db_routes)
+
+
+def test_non_db_routes_do_not_take_db_slots():
+    """Con el cupo de DB ocupado, la recarga de BINs (sin DB) no espera ni se rechaza."""
+    stats.reset()
+    app = build_app(rate=1000, burst=1000, max_inflight=1, max_queue=0, max_wait=0.05)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/cobros/bloqueante"))
+            await asyncio.sleep(0.05)
+            reload_response = await client.post("/tarjetas/bins/recargar")
+            return await first, reload_response
+
+    first, reload_response = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert reload_response.status_code == 200
+    assert stats.shed_overloaded == 0
+    assert stats.admitted == 2
+    assert stats.in_flight == 0
@@ -77,6 +77,8 @@ def test_02_full_workflow_crud_tarjetas(client):
     data = response.json()
     assert data["last4"] == "1111"
     assert data["pan_masked"] == "************1111"
+    assert data["red"] == "VISA"
+    assert data["tipo"] == "credito"
     test_data["tarjeta_aprobar_id"] = data["_id"]
 
     tarjeta_rechazar = {
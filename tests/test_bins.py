@@ -0,0 +1,151 @@
+import random
+import pytest
+from app.bins import BinTable, BinIndex
+
+
+ROWS = [
+    ("411111", "411111", "VISA", "Banco A", "credito"),
+    ("41111112", "41111119", "VISA", "Banco A", "debito"),
+    ("510000", "559999", "MASTERCARD", "Banco B", "credito"),
+]
+
+
+def test_lookup_6_digit_range():
+    table = BinTable(ROWS)
+    assert table.lookup("5200000000000007") == ("MASTERCARD", "Banco B", "credito")
+    assert table.lookup("4111111111111111") == ("VISA", "Banco A", "credito")
+
+
+def test_lookup_8_digit_range_takes_precedence():
+    table = BinTable(ROWS)
+    assert table.lookup("4111111311111111") == ("VISA", "Banco A", "debito")
+
+
+def test_lookup_nested_ranges_narrowest_wins():
+    """Un rango de emisor anidado dentro de un rango de red más amplio."""
+    table = BinTable([
+        ("400000", "499999", "VISA", "Gen", "credito"),
+        ("411111", "411111", "VISA", "A", "debito"),
+        ("410000", "419999", "VISA", "B", "prepago"),
+    ])
+
+    assert table.lookup("4200000000000000") == ("VISA", "Gen", "credito")
+    assert table.lookup("4111111111111111") == ("VISA", "A", "debito")
+    assert table.lookup("4111120000000000") == ("VISA", "B", "prepago")
+    assert table.lookup("4999990000000000") == ("VISA", "Gen", "credito")
+    assert len(table) == 3
+
+
+def test_lookup_overlapping_ranges_match_brute_force():
+    rng = random.Random(0)
+    rows = []
+    for i in range(200):
+        start = rng.randrange(400000, 401000)
+        end = start + rng.randrange(0, 200)
+        rows.append((f"{start:06d}", f"{end:06d}", "VISA", f"Banco {i}", "credito"))
+
+    table = BinTable(rows)
+
+    for value in range(399990, 401210):
+        covering = [(int(r[1]) - int(r[0]), -i, r) for i, r in enumerate(rows) if int(r[0]) <= value <= int(r[1])]
+        expected = tuple(min(covering)[2][2:]) if covering else None
+        assert table.lookup(f"{value:06d}0000000000") == expected
+
+
+def test_lookup_6_digit_range_beats_wider_8_digit_range():
+    """La regla del más angosto aplica también entre longitudes de BIN."""
+    table = BinTable([
+        ("411111", "411111", "VISA", "A", "credito"),
+        ("40000000", "49999999", "VISA", "Red", "credito"),
+    ])
+
+    assert table.lookup("4111111111111111") == ("VISA", "A", "credito")
+    assert table.lookup("4111120000000000") == ("VISA", "Red", "credito")
+    assert table.lookup("411111") == ("VISA", "A", "credito")
+
+
+def test_lookup_unknown_or_invalid():
+    table = BinTable(ROWS)
+    assert table.lookup("6011000000000004") is None
+    assert table.lookup("4111") is None
+    assert table.lookup("ABCDEFGH") is None
+
+
+def test_lookup_many():
+    table = BinTable(ROWS)
+    assert table.lookup_many(["5100000000000008", "9999999999999995"]) == [("MASTERCARD", "Banco B", "credito"), None]
+
+
+def test_invalid_ranges():
+    with pytest.raises(ValueError):
+        BinTable([("4111", "4111", "VISA", "Banco A", "credito")])
+    with pytest.raises(ValueError):
+        BinTable([("559999", "510000", "MASTERCARD", "Banco B", "credito")])
+
+
+def test_index_hot_reload(tmp_path):
+    """La recarga sustituye la tabla y un archivo inexistente deja el índice vacío."""
+    path = tmp_path / "bins.csv"
+    path.write_text("inicio,fin,red,emisor,tipo\n411111,411111,VISA,Banco A,credito\n", encoding="utf-8")
+
+    index = BinIndex(str(path))
+    assert index.load() == 1
+    assert index.enrich("4111111111111111") == {"red": "VISA", "emisor": "Banco A", "tipo": "credito"}
+
+    path.write_text("inicio,fin,red,emisor,tipo\n411111,411111,VISA,Banco C,prepago\n", encoding="utf-8")
+    index.load()
+    assert index.enrich_many(["4111111111111111"]) == [{"red": "VISA", "emisor": "Banco C", "tipo": "prepago"}]
+
+    with pytest.raises(FileNotFoundError):
+        index.load(str(tmp_path / "no_existe.csv"))
+    assert index.path == str(path)
+    assert index.enrich("4111111111111111")["emisor"] == "Banco C"
+
+    assert index.load(str(tmp_path / "no_existe.csv"), allow_missing=True) == 0
+    assert index.enrich("4111111111111111") == {"red": None, "emisor": None, "tipo": None}
+
+
+def test_index_reload_invalid_file_keeps_previous_table(tmp_path):
+    path = tmp_path / "bins.csv"
+    path.write_text("inicio,fin,red,emisor,tipo\n411111,411111,VISA,Banco A,credito\n", encoding="utf-8")
+    bad = tmp_path / "malo.csv"
+    bad.write_text("inicio,fin,red,emisor,tipo\n4111,4111,VISA,Banco A,credito\n", encoding="utf-8")
+
+    index = BinIndex(str(path))
+    index.load()
+
+    with pytest.raises(ValueError):
+        index.load(str(bad))
+
+    assert index.path == str(path)
+    assert index.lookup("4111111111111111") == ("VISA", "Banco A", "credito")
+
+
+def test_reload_endpoint(tmp_path, monkeypatch):
+    """La recarga por API requiere token, devuelve los rangos cargados y si falla responde 500 y conserva la tabla."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.bins import bin_index
+    from app.api import tarjetas
+
+    path = tmp_path / "bins.csv"
+    path.write_text("inicio,fin,red,emisor,tipo\n411111,411111,VISA,Banco A,credito\n", encoding="utf-8")
+    monkeypatch.setattr(bin_index, "path", str(path))
+    monkeypatch.setattr(bin_index, "table", BinTable())
+    client = TestClient(app)
+
+    assert client.post("/tarjetas/bins/recargar").status_code == 403
+
+    monkeypatch.setattr(tarjetas, "BIN_RELOAD_TOKEN", "secreto")
+    assert client.post("/tarjetas/bins/recargar").status_code == 403
+    assert client.post("/tarjetas/bins/recargar", headers={"X-Admin-Token": "otro"}).status_code == 403
+    assert bin_index.lookup("4111111111111111") is None
+
+    response = client.post("/tarjetas/bins/recargar", headers={"X-Admin-Token": "secreto"})
+    assert response.status_code == 200
+    assert response.json() == {"rangos": 1}
+
+    path.unlink()
+    response = client.post("/tarjetas/bins/recargar", headers={"X-Admin-Token": "secreto"})
+    assert response.status_code == 500
+    assert bin_index.lookup("4111111111111111") == ("VISA", "Banco A", "credito")
@@ -1,4 +1,5 @@
-from app.luhn import validate_luhn, generate_luhn
+import pytest
+from app.luhn import validate_luhn, generate_luhn, generate_luhn_with_last4
 
 
 
@@ -42,3 +43,21 @@ def test_generate_luhn_different_runs():
     assert gen1 != gen2
     assert validate_luhn(gen1)
     assert validate_luhn(gen2)
+
+
+def test_generate_luhn_with_last4():
+    for last4 in ["1111", "2222", "3333", "0420"]:
+        generated_pan = generate_luhn_with_last4("411111", 16, last4)
+
+        assert len(generated_pan) == 16
+        assert generated_pan.startswith("411111")
+        assert generated_pan.endswith(last4)
+        assert validate_luhn(generated_pan) == True
+
+
+def test_generate_luhn_with_last4_invalid_input():
+    with pytest.raises(ValueError, match="4 dígitos"):
+        generate_luhn_with_last4("411111", 16, "111")
+
+    with pytest.raises(ValueError, match="longitud total"):
+        generate_luhn_with_last4("41111111111", 14, "1111")
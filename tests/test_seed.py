@@ -0,0 +1,98 @@
+import json
+import pytest
+from datetime import datetime
+from app.seed import build_parser, generate_chunk, main
+
+
+def build_config(**overrides):
+    args = build_parser().parse_args([])
+    config = {
+        "tarjetas_por_cliente": args.tarjetas_por_cliente,
+        "cobros_por_tarjeta": args.cobros_por_tarjeta,
+        "last4_mix": args.last4_mix,
+        "bins": ["411111"],
+        "dias": 30,
+        "reembolsos": 0.5,
+        "semilla": 0,
+        "ahora": datetime(2025, 1, 1),
+    }
+    config.update(overrides)
+    return config
+
+
+def test_generate_chunk_distribution():
+    """Respeta los rangos de tarjetas/cobros y referencia los IDs generados."""
+    docs = generate_chunk(0, 50, build_config(tarjetas_por_cliente=(2, 2), cobros_por_tarjeta=(3, 3)))
+
+    assert len(docs["clientes"]) == 50
+    assert len(docs["tarjetas"]) == 100
+    assert len(docs["cobros"]) == 300
+
+    cliente_ids = {c["_id"] for c in docs["clientes"]}
+    tarjeta_ids = {t["_id"] for t in docs["tarjetas"]}
+    assert all(t["cliente_id"] in cliente_ids for t in docs["tarjetas"])
+    assert all(c["tarjeta_id"] in tarjeta_ids for c in docs["cobros"])
+
+
+def test_generate_chunk_follows_simulation_rules():
+    """Los estados de los cobros siguen las reglas de simular_cobro según last4."""
+    docs = generate_chunk(0, 200, build_config(last4_mix=(["2222", "3333"], [1, 1])))
+    last4_por_tarjeta = {t["_id"]: t["last4"] for t in docs["tarjetas"]}
+
+    for cobro in docs["cobros"]:
+        last4 = last4_por_tarjeta[cobro["tarjeta_id"]]
+        if last4 == "2222":
+            assert (cobro["status"], cobro["codigo_motivo"]) == ("declined", "51")
+            assert cobro["reembolsado"] == False
+        elif cobro["monto"] > 1000:
+            assert (cobro["status"], cobro["codigo_motivo"]) == ("declined", "61")
+        else:
+            assert cobro["status"] == "approved"
+
+        assert cobro["fecha_intento"] <= datetime(2025, 1, 1)
+
+
+def test_dry_run_writes_ndjson(tmp_path):
+    exit_code = main(["--clientes", "30", "--clientes-por-bloque", "10", "--workers", "1", "--dry-run", str(tmp_path)])
+
+    assert exit_code == 0
+
+    clientes = []
+    for path in sorted(tmp_path.glob("clientes-*.ndjson")):
+        clientes += [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    assert len(clientes) == 30
+    assert "$oid" in clientes[0]["_id"]
+    assert len(list(tmp_path.glob("cobros-*.ndjson"))) == 3
+
+
+def test_chunk_seeds_do_not_overlap_across_semillas():
+    """El bloque 1 con semilla 0 no debe repetir el bloque 0 con semilla 1."""
+    a = generate_chunk(1, 20, build_config(semilla=0))
+    b = generate_chunk(0, 20, build_config(semilla=1))
+
+    assert [c["telefono"] for c in a["clientes"]] != [c["telefono"] for c in b["clientes"]]
+    assert [c["telefono"] for c in generate_chunk(1, 20, build_config(semilla=0))["clientes"]] == [c["telefono"] for c in a["clientes"]]
+
+
+def test_parser_rejects_invalid_values():
+    parser = build_parser()
+
+    for argv in (["--clientes-por-bloque", "0"], ["--batch-size", "0"], ["--workers", "-1"], ["--reembolsos", "1.5"], ["--reembolsos", "-0.1"],
+                 ["--bins", "4111x1"], ["--bins", "411111111111"], ["--bins", ","], ["--dias", "-30"]):
+        with pytest.raises(SystemExit):
+            parser.parse_args(argv)
+
+    assert parser.parse_args(["--reembolsos", "1"]).reembolsos == 1.0
+    assert parser.parse_args(["--bins", "41111111111, 510000"]).bins == ["41111111111", "510000"]
+    assert parser.parse_args(["--dias", "0"]).dias == 0
+    assert parser.parse_args([]).bins == ["411111", "400000", "450000", "510000", "601100"]
+
+
+def test_emails_depend_on_semilla():
+    """Sembrar de nuevo con otra semilla no repite los emails de los clientes."""
+    a = generate_chunk(0, 5, build_config(semilla=0))
+    b = generate_chunk(0, 5, build_config(semilla=1))
+
+    assert not {c["email"] for c in a["clientes"]} & {c["email"] for c in b["clientes"]}
+